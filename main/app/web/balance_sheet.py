@@ -1,20 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import io
-from typing import List, Dict, Any, Optional, Tuple
+import re
+import threading
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Union
 
+import numpy as np
 import pandas as pd
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 
-from quart import Blueprint, render_template, request, Response, redirect, url_for
+from quart import Blueprint, render_template, stream_template, request, Response, redirect, url_for
+
+from markupsafe import Markup, escape
 
 from main.core.logic_engine import LogicEngine
 
 
 bp = Blueprint("balance_sheet", __name__)
 
+# Schema of every period table; the template renders these columns in order
+_TABLE_COLUMNS: Tuple[str, ...] = ("line_item", "value", "value_numeric")
+
 
 def _status() -> str:
     s = LogicEngine.get_state().find("status", default="")
@@ -28,6 +34,32 @@ def _balance_sheet_root() -> Dict[str, Dict[str, Any]]:
     return {}
 
 
+# Everything this module derives from the parsed statement (periods, tables,
+# lookups, rendered pages and plots) is cached as module state and handed out
+# without copies, so callers must not mutate it. _sync_caches is the one
+# version check: a new parse drops it all, and each piece rebuilds lazily.
+_cache_version: Optional[int] = None
+
+
+def _sync_caches() -> None:
+    global _cache_version, _periods_cache, _period_index, _raw_long_cache
+
+    version = LogicEngine.get_state().version
+    if _cache_version == version:
+        return
+
+    _periods_cache = None
+    _period_index = None
+    _raw_long_cache = None
+    _render_cache.clear()
+    _plot_cache.clear()
+    _line_plot_cache.clear()
+    _cache_version = version
+
+
+_periods_cache: Optional[List[str]] = None
+
+
 def _periods_list() -> List[str]:
     """
     Returns periods in display order (most recent first) if possible.
@@ -35,9 +67,29 @@ def _periods_list() -> List[str]:
     periods in that right-to-left order. Dicts preserve insertion order in Python 3.7+,
     so we keep the dict key order.
     """
+    global _periods_cache
+
+    _sync_caches()
+    if _periods_cache is not None:
+        return _periods_cache
+
     root = _balance_sheet_root()
-    periods = [str(p) for p in root.keys() if str(p).strip()]
-    return periods
+    keys = pd.Series(list(root.keys()), dtype=object).astype(str)
+    _periods_cache = keys[keys.str.strip().ne("")].unique().tolist()
+    return _periods_cache
+
+
+def _parse_period_idx(raw: Optional[str]) -> int:
+    """
+    Parses the period_idx query arg; anything that isn't an integer falls back to 0.
+    Gated with isdecimal() so bad input doesn't go through exception handling.
+    """
+    if not raw:
+        return 0
+    digits = raw[1:] if raw[0] == "-" else raw
+    if not digits.isdecimal():
+        return 0
+    return int(raw)
 
 
 def _fmt_number(x: object) -> str:
@@ -58,139 +110,412 @@ def _fmt_number(x: object) -> str:
     return f"{v:,.0f}"
 
 
-def _coerce_numeric(x: object) -> Optional[float]:
-    if x is None or x == "":
-        return None
-    try:
-        return float(x)
-    except Exception:
-        return None
+# (divisor, suffix) buckets for _fmt_numbers, largest first (same thresholds as _fmt_number)
+_FMT_UNITS: Tuple[Tuple[float, str], ...] = ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K"))
+_FMT_DIVISORS = np.array([d for d, _ in _FMT_UNITS], dtype=np.float64)
+
+
+def _classify_magnitudes(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized magnitude check for a float array.
+    Returns (unit_idx, scaled): unit_idx indexes _FMT_UNITS (-1 = no suffix),
+    scaled is x divided by that unit's divisor.
+    """
+    abs_x = np.abs(x)
+    unit_idx = np.select(
+        [abs_x >= d for d in _FMT_DIVISORS],
+        list(range(len(_FMT_DIVISORS))),
+        default=-1
+    )
+    scaled = np.where(unit_idx >= 0, x / _FMT_DIVISORS[np.clip(unit_idx, 0, None)], x)
+    return unit_idx, scaled
 
 
-def _period_table(period: str) -> pd.DataFrame:
+def _fmt_numbers(values: List[object]) -> List[str]:
+    """
+    Bulk _fmt_number: classifies every value in one numpy pass, then does a
+    single format pass. Non-numeric values fall back to _fmt_number.
+    """
+    if not values:
+        return []
+
+    raw = pd.Series(values, dtype=object)
+    nums = pd.to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64)
+    unit_idx, scaled = _classify_magnitudes(nums)
+
+    out: List[str] = []
+    for v, u, s, ok in zip(values, unit_idx.tolist(), scaled.tolist(), (~np.isnan(nums)).tolist()):
+        if not ok:
+            out.append(_fmt_number(v))
+        elif u >= 0:
+            out.append(f"{s:.2f}{_FMT_UNITS[u][1]}")
+        else:
+            out.append(f"{s:,.0f}")
+    return out
+
+
+def _fmt_number_series(s: pd.Series) -> pd.Series:
+    """
+    Vectorized _fmt_number over a Series (same index), via _fmt_numbers.
+    Missing values (NaN/None) render as "—".
+    """
+    vals = s.astype(object).where(s.notna(), None).tolist()
+    return pd.Series(_fmt_numbers(vals), index=s.index, dtype=object)
+
+
+# Per-period tables + top items plot data, built together once per parse
+_period_index: Optional[Dict[str, pd.DataFrame]] = None
+_period_top_items: Dict[str, Tuple[List[str], List[float]]] = {}
+_period_row_index: Dict[str, List[Dict[str, Any]]] = {}  # filled lazily by _period_rows
+
+
+def _period_tables() -> Dict[str, pd.DataFrame]:
+    """
+    Returns {period: table} for every period, built once per parse.
+    Requests then do a dict lookup instead of rebuilding the frame each hit.
+    """
+    global _period_index, _period_top_items, _period_row_index
+
+    _sync_caches()
+    if _period_index is not None:
+        return _period_index
+
+    root = _balance_sheet_root()
+    _period_index = {
+        str(p): _build_period_table(period_dict)
+        for p, period_dict in root.items()
+        if isinstance(period_dict, dict) and period_dict
+    }
+    _period_top_items = {p: _build_top_items(df) for p, df in _period_index.items()}
+    _period_row_index = {}
+    return _period_index
+
+
+def _top_items(period: str) -> Tuple[List[str], List[float]]:
+    """
+    Returns (labels, values) for the largest |value_numeric| line items of a period,
+    precomputed alongside the period tables.
+    """
+    _period_tables()
+    return _period_top_items.get(period, ([], []))
+
+
+def _build_top_items(df: pd.DataFrame, n: int = 12) -> Tuple[List[str], List[float]]:
+    if df.empty or "value_numeric" not in df.columns or "line_item" not in df.columns:
+        return [], []
+
+    # value_numeric is already float64 (see _build_period_table)
+    vals = df["value_numeric"].to_numpy()
+    keep = ~np.isnan(vals)
+    if not keep.any():
+        return [], []
+
+    labels = df["line_item"].to_numpy()[keep]
+    vals = vals[keep]
+    absv = np.abs(vals)
+
+    # Partial selection of the n largest |value|, then order just those
+    # (ties keep table order)
+    k = min(n, len(vals))
+    top = np.sort(np.argpartition(-absv, k - 1)[:k])
+    top = top[np.argsort(-absv[top], kind="stable")]
+
+    return labels[top].tolist(), vals[top].tolist()
+
+
+def _top_items_svg(labels: List[str], vals: List[float], title: str) -> Markup:
+    """
+    Inline SVG horizontal bar chart of the top items (largest first), for the debug panel.
+    Rendered straight into the page: no matplotlib rasterizing/PNG encode and no
+    second request. Bars grow from a zero line so negative values point left.
+    """
+    if not labels:
+        return Markup("")
+
+    width, label_w, value_w, row_h, top = 1000, 300, 80, 24, 34
+    plot_w = width - label_w - value_w
+    height = top + row_h * len(labels) + 8
+
+    lo = min(0.0, min(vals))
+    hi = max(0.0, max(vals))
+    span = (hi - lo) or 1.0
+    zero_x = label_w + (0.0 - lo) / span * plot_w
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" width="100%" '
+        f'role="img" aria-label="{escape(title)}" style="color: var(--text);">',
+        f'<text x="{width / 2:.0f}" y="20" text-anchor="middle" font-size="14" font-weight="700" '
+        f'fill="currentColor">{escape(title)}</text>',
+    ]
+
+    for i, (label, v, display) in enumerate(zip(labels, vals, _fmt_numbers(vals))):
+        y = top + i * row_h
+        bar_x = label_w + (v - lo) / span * plot_w
+        x0, x1 = min(zero_x, bar_x), max(zero_x, bar_x)
+        parts.append(
+            f'<text x="{label_w - 8}" y="{y + row_h * 0.65:.1f}" text-anchor="end" font-size="11" '
+            f'fill="currentColor">{escape(label)}</text>'
+        )
+        parts.append(
+            f'<rect x="{x0:.1f}" y="{y + 4}" width="{max(x1 - x0, 1.0):.1f}" height="{row_h - 8}" '
+            f'style="fill: var(--accent);"><title>{escape(label)}: {escape(display)}</title></rect>'
+        )
+        parts.append(
+            f'<text x="{width - value_w + 8}" y="{y + row_h * 0.65:.1f}" font-size="11" '
+            f'fill="currentColor">{escape(display)}</text>'
+        )
+
+    parts.append(
+        f'<line x1="{zero_x:.1f}" y1="{top}" x2="{zero_x:.1f}" y2="{height - 4}" '
+        f'stroke="currentColor" stroke-opacity="0.4"/>'
+    )
+    parts.append("</svg>")
+    return Markup("".join(parts))
+
+
+def _period_df(period: str) -> pd.DataFrame:
+    """
+    Looks up the prebuilt table for one period:
+        line_item | value | value_numeric
+    Falls back to an empty table if the period is unknown or unparsed.
+    Only needed where DataFrame ops are used (key metric scan); the page
+    table itself comes from _period_rows.
+    """
+    df = _period_tables().get(period, None)
+    if df is None:
+        return pd.DataFrame(columns=list(_TABLE_COLUMNS))
+    return df
+
+
+def _period_rows(period: str) -> List[Dict[str, Any]]:
+    """
+    Template rows (line_item/value/value_numeric dicts) for one period,
+    transposed from its table once per parse rather than once per render.
+    """
+    tables = _period_tables()
+    rows = _period_row_index.get(period, None)
+    if rows is None:
+        df = tables.get(period, None)
+        rows = _df_records(df, _TABLE_COLUMNS) if df is not None else []
+        _period_row_index[period] = rows
+    return rows
+
+
+def _df_records(df: pd.DataFrame, columns: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+    """
+    Column-wise replacement for df.to_dict(orient="records").
+    One .tolist() per column instead of boxing every cell; NaN/None become "".
+    columns: optional subset to emit (e.g. to leave helper columns out).
+    """
+    cols = list(columns) if columns is not None else list(df.columns)
+    arrs = []
+    for c in cols:
+        s = df[c]
+        # Only columns that actually hold missing values pay for the object cast
+        arrs.append(s.astype(object).fillna("").tolist() if s.hasnans else s.tolist())
+    return [dict(zip(cols, row)) for row in zip(*arrs)]
+
+
+def _build_period_table(period_dict: Dict[str, Any]) -> pd.DataFrame:
     """
     Builds a table for one period:
         line_item | value | value_numeric
     Your balance_sheet dict stores value as numeric when possible, raw otherwise.
     We set both value and value_numeric based on that.
     """
-    root = _balance_sheet_root()
-    period_dict = root.get(period, None)
-
-    if not isinstance(period_dict, dict) or not period_dict:
-        return pd.DataFrame(columns=["line_item", "value", "value_numeric"])
-
-    rows: List[Dict[str, Any]] = []
-    for line_item, val in period_dict.items():
-        vn = _coerce_numeric(val)
-        rows.append({
-            "line_item": str(line_item),
-            "value": val if val is not None else "",
-            "value_numeric": vn,
-        })
+    vals = list(period_dict.values())
+    df = pd.DataFrame(
+        {
+            "line_item": [str(li) for li in period_dict.keys()],
+            "value": [v if v is not None else "" for v in vals],
+        },
+        columns=["line_item", "value"]
+    )
+    df["value"] = df["value"].fillna("")
+    # Coerce the whole column in one go so readers get float64 (NaN = non-numeric)
+    # and never need pd.to_numeric; _df_records blanks the NaNs for the template
+    df["value_numeric"] = pd.to_numeric(pd.Series(vals, dtype=object), errors="coerce").astype("float64").to_numpy()
+    # Lowercased labels are shared by every key metric scan; not rendered (see _TABLE_COLUMNS)
+    df["_li_lower"] = df["line_item"].astype(str).str.lower()
+    return df
+
 
-    df = pd.DataFrame(rows, columns=["line_item", "value", "value_numeric"])
-    df = df.where(pd.notna(df), "")
-    return df.reset_index(drop=True)
+# Long-form table + line item lookups, built together once per parse
+_raw_long_cache: Optional[pd.DataFrame] = None
+_line_items_exact: set = set()
+_line_items_lower: Dict[str, str] = {}  # lower().strip() -> first matching label
 
 
 def _raw_income_long() -> pd.DataFrame:
+    """
+    Returns the long-form table (built once per parse):
+        line_item | period | value | value_numeric | _li_lower
+    line_item and period are categoricals (see _build_raw_long).
+    _li_lower is the lower().strip() label, computed in one vectorized pass and
+    reused for the case-insensitive line item index.
+    """
+    global _raw_long_cache, _line_items_exact, _line_items_lower
+
+    _sync_caches()
+    if _raw_long_cache is not None:
+        return _raw_long_cache
+
+    df = _build_raw_long()
+    # .str on a categorical only lowercases each distinct label once
+    df["_li_lower"] = df["line_item"].str.lower().str.strip()
+
+    # First label (in table order) wins for each lowercased key
+    firsts = df.drop_duplicates("_li_lower")
+
+    _raw_long_cache = df
+    _line_items_exact = set(df["line_item"].tolist())
+    _line_items_lower = dict(zip(firsts["_li_lower"].tolist(), firsts["line_item"].tolist()))
+    return df
+
+
+def _build_raw_long() -> pd.DataFrame:
     """
     Builds a long-form table from nested dicts:
         line_item | period | value | value_numeric
+    Each period contributes one key list and one value list; the columns are
+    then a few numpy concatenations, with the period column from np.repeat.
     """
     root = _balance_sheet_root()
     if not root:
         return pd.DataFrame(columns=["line_item", "period", "value", "value_numeric"])
 
-    records: List[Dict[str, Any]] = []
+    p_keys: List[str] = []
+    li_lists: List[List[str]] = []
+    v_lists: List[List[Any]] = []
     for period, period_dict in root.items():
         if not isinstance(period_dict, dict):
             continue
-        for line_item, val in period_dict.items():
-            vn = _coerce_numeric(val)
-            records.append({
-                "line_item": str(line_item),
-                "period": str(period),
-                "value": val if val is not None else "",
-                "value_numeric": vn,
-            })
+        p_keys.append(str(period))
+        li_lists.append([str(li) for li in period_dict.keys()])
+        v_lists.append(list(period_dict.values()))
 
-    df = pd.DataFrame(records, columns=["line_item", "period", "value", "value_numeric"])
-    df = df.where(pd.notna(df), "")
-    return df.reset_index(drop=True)
+    if not p_keys:
+        return pd.DataFrame(columns=["line_item", "period", "value", "value_numeric"])
 
+    lens = np.fromiter((len(x) for x in li_lists), dtype=np.int64, count=len(li_lists))
+    li_arr = np.concatenate([np.array(x, dtype=object) for x in li_lists])
+    p_arr = np.repeat(np.array(p_keys, dtype=object), lens)
+    v_arr = np.concatenate([np.array(x, dtype=object) for x in v_lists])
+    # One vectorized coercion for every cell ("" / None / text -> NaN)
+    vn_arr = pd.to_numeric(pd.Series(v_arr, dtype=object), errors="coerce").astype("float64").to_numpy()
+    v_arr[pd.isna(v_arr)] = ""
+
+    df = pd.DataFrame(
+        {"line_item": li_arr, "period": p_arr, "value": v_arr, "value_numeric": vn_arr},
+        columns=["line_item", "period", "value", "value_numeric"]
+    )
+    # Labels and periods repeat across rows; as categoricals, equality masks
+    # compare int codes instead of strings
+    df["line_item"] = pd.Categorical(df["line_item"])
+    df["period"] = pd.Categorical(df["period"])
+    return df
+
+
+# (metric name, needles) for the key metric cards; each needle list is compiled
+# once into a single alternation regex used by _best_metric
+_KEY_METRIC_DEFS: List[Tuple[str, List[str]]] = [
+    ("Total Assets", ["total assets", "assets"]),
+    ("Total Liabilities", ["liabilities, total liabilities, total liability"]),
+    ("Total Equity", ["equity", "total equity"]),
+    ("Net Income", ["net income", "net earnings", "net profit"]),
+]
+_KEY_METRIC_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    (name, re.compile("|".join(re.escape(n) for n in needles)))
+    for name, needles in _KEY_METRIC_DEFS
+]
+
+
+def _best_metric(
+    statement_df: pd.DataFrame,
+    needles: Union[List[str], re.Pattern],
+    li_lower: Optional[pd.Series] = None,
+    value_numeric: Optional[np.ndarray] = None
+) -> Optional[float]:
+    """
+    Returns value_numeric of the first line_item containing any of the needles.
+    Single vectorized str.contains pass instead of iterating rows.
+    needles may be a precompiled alternation (see _KEY_METRIC_PATTERNS).
 
-def _best_metric(statement_df: pd.DataFrame, needles: List[str]) -> Optional[float]:
+    li_lower / value_numeric: optional precomputed lowercased line_item column
+    and value_numeric array, so callers scanning several metrics only pull
+    them out of the frame once.
+    """
     if statement_df is None or statement_df.empty:
         return None
     if "line_item" not in statement_df.columns:
         return None
 
-    for _, row in statement_df.iterrows():
-        li = str(row.get("line_item", "")).lower()
-        if any(n in li for n in needles):
-            vn = row.get("value_numeric", None)
-            if vn is None or vn == "":
-                return None
-            try:
-                return float(vn)
-            except Exception:
-                return None
-    return None
+    li = li_lower if li_lower is not None else statement_df["line_item"].astype(str).str.lower()
+    pat = needles if isinstance(needles, re.Pattern) else "|".join(re.escape(n) for n in needles)
+    mask = li.str.contains(pat, regex=True, na=False).to_numpy()
+    if not mask.any():
+        return None
+
+    if value_numeric is None:
+        if "value_numeric" not in statement_df.columns:
+            return None
+        value_numeric = statement_df["value_numeric"].to_numpy()
+
+    # Position of the first hit; the frame's index labels don't matter
+    vn = value_numeric[mask.argmax()]
+    if vn is None or vn == "" or pd.isna(vn):
+        return None
+    try:
+        return float(vn)
+    except Exception:
+        return None
 
 
 def _compute_key_metrics(statement_df: pd.DataFrame) -> List[Dict[str, Any]]:
-    defs = [
-        ("Total Assets", ["total assets", "assets"]),
-        ("Total Liabilities", ["liabilities, total liabilities, total liability"]),
-        ("Total Equity", ["equity", "total equity"]),
-        ("Net Income", ["net income", "net earnings", "net profit"]),
-    ]
+    li_lower = None
+    value_numeric = None
+    if statement_df is not None:
+        if "_li_lower" in statement_df.columns:
+            li_lower = statement_df["_li_lower"]
+        if "value_numeric" in statement_df.columns:
+            value_numeric = statement_df["value_numeric"].to_numpy()
 
     metrics: List[Dict[str, Any]] = []
-    for name, needles in defs:
-        val = _best_metric(statement_df, needles)
+    for name, pattern in _KEY_METRIC_PATTERNS:
+        val = _best_metric(statement_df, pattern, li_lower, value_numeric)
         metrics.append({
             "name": name,
             "value": val,
-            "display": _fmt_number(val),
         })
 
-    max_abs = 0.0
-    for m in metrics:
-        if m["value"] is not None:
-            max_abs = max(max_abs, abs(float(m["value"])))
+    for m, display in zip(metrics, _fmt_numbers([m["value"] for m in metrics])):
+        m["display"] = display
 
-    for m in metrics:
-        v = m["value"]
-        if v is None or max_abs == 0:
-            m["pct"] = 0
-        else:
-            m["pct"] = int(round((abs(float(v)) / max_abs) * 100))
+    abs_vals = np.abs(np.array([m["value"] if m["value"] is not None else 0.0 for m in metrics], dtype=np.float64))
+    max_abs = abs_vals.max() if abs_vals.size else 0.0
+    if max_abs > 0:
+        pcts = np.round(abs_vals / max_abs * 100).astype(int).tolist()
+    else:
+        pcts = [0] * len(metrics)
+
+    for m, pct in zip(metrics, pcts):
+        m["pct"] = pct
 
     return metrics
 
 
-def _resolve_line_item(raw_df: pd.DataFrame, line_item: str) -> Optional[str]:
+def _resolve_line_item(line_item: str) -> Optional[str]:
     """
     Try to match a line_item from the URL to an actual row label.
     First tries exact match, then case-insensitive match.
+    Both are dict/set lookups against indexes built with the long-form table.
     """
-    if raw_df.empty or "line_item" not in raw_df.columns:
-        return None
-
-    candidates = raw_df["line_item"].dropna().astype(str).tolist()
+    _raw_income_long()
 
-    if line_item in candidates:
+    if line_item in _line_items_exact:
         return line_item
 
-    li_lower = line_item.lower().strip()
-    for c in candidates:
-        if str(c).lower().strip() == li_lower:
-            return str(c)
-
-    return None
+    return _line_items_lower.get(line_item.lower().strip(), None)
 
 
 def _series_for_line_item(raw_df: pd.DataFrame, periods: List[str], line_item: str) -> pd.DataFrame:
@@ -205,69 +530,197 @@ def _series_for_line_item(raw_df: pd.DataFrame, periods: List[str], line_item: s
     if not {"period", "line_item"}.issubset(set(raw_df.columns)):
         return pd.DataFrame(columns=["period", "value_numeric", "value_display"])
 
-    df = raw_df.copy()
-    df["line_item"] = df["line_item"].astype(str)
-    df["period"] = df["period"].astype(str)
-
-    view = df[df["line_item"] == line_item].copy()
-    if view.empty:
+    # Mask straight off the shared frame; nothing here needs a copy of it
+    mask = (raw_df["line_item"] == line_item).to_numpy()
+    if not mask.any():
         return pd.DataFrame(columns=["period", "value_numeric", "value_display"])
 
-    view["value_numeric"] = pd.to_numeric(view.get("value_numeric", None), errors="coerce")
+    vn = pd.Series(pd.to_numeric(raw_df["value_numeric"].to_numpy()[mask], errors="coerce"))
+    view_periods = raw_df["period"].to_numpy()[mask]
+
+    # First numeric value per period in one groupby pass (first() skips NaN),
+    # aligned to display order
+    firsts = vn.groupby(view_periods, sort=False).first().reindex(periods)
+    out = pd.DataFrame(
+        {
+            "period": list(periods),
+            "value_numeric": firsts.to_numpy(),
+            "value_display": _fmt_number_series(firsts).to_numpy(),
+        },
+        columns=["period", "value_numeric", "value_display"]
+    )
+    return out
+
 
-    rows: List[Dict[str, Any]] = []
-    for p in periods:
-        sub = view[view["period"] == p]
-        if sub.empty:
-            rows.append({"period": p, "value_numeric": None, "value_display": "—"})
-            continue
+# One figure reused by every top items plot (cleared per render instead of
+# rebuilt). Renders run in worker threads, so this is a thread lock that keeps
+# two of them from drawing on it at once.
+_PLOT_FIG = None
+_PLOT_LOCK = threading.Lock()
 
-        vn = None
-        for x in sub["value_numeric"].tolist():
-            if pd.notna(x):
-                vn = float(x)
-                break
 
-        rows.append({"period": p, "value_numeric": vn, "value_display": _fmt_number(vn)})
+def _new_figure(figsize: Tuple[float, float], dpi: int):
+    # Figures are built on an Agg canvas directly rather than through pyplot, so
+    # there is no global figure manager to register with or close afterwards.
+    # matplotlib is only imported once a PNG route is hit, keeping it (plus its
+    # font/PIL stack) out of app start-up.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
 
-    out = pd.DataFrame(rows, columns=["period", "value_numeric", "value_display"])
-    return out
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _plot_fig():
+    # Call with _PLOT_LOCK held
+    global _PLOT_FIG
+    if _PLOT_FIG is None:
+        _PLOT_FIG = _new_figure((10, 5), dpi=140)
+    return _PLOT_FIG
+
+
+def _render_line_item_plot(series_df: pd.DataFrame, resolved: str) -> bytes:
+    """
+    Draws one line item over time (oldest -> newest) and returns the PNG bytes.
+    Plain sync so the route can run it off the event loop; each call gets its
+    own figure, so concurrent renders don't share state.
+    """
+    plot_df = series_df.iloc[::-1]  # oldest -> newest; value_numeric is already float
+
+    x = plot_df["period"].tolist()
+    y = plot_df["value_numeric"].tolist()
+
+    max_ticks = 6
+    xs = list(range(len(x)))
+
+    fig = _new_figure((10, 4.5), dpi=150)
+    ax = fig.add_subplot(111)
+    ax.plot(xs, y, marker="o")
+
+    n = len(xs)
+    if n <= max_ticks:
+        tick_pos = xs
+        tick_labels = x
+    else:
+        step = (n - 1) / (max_ticks - 1)
+        tick_pos = [int(round(i * step)) for i in range(max_ticks)]
+        tick_labels = [x[i] for i in tick_pos]
+
+    ax.set_xticks(tick_pos)
+    ax.set_xticklabels(tick_labels, rotation=35, fontsize=8)
+
+    ax.set_title(f"{resolved} over time")
+    ax.set_xlabel("Period")
+    ax.set_ylabel("Value (numeric)")
+    # Fixed margins instead of tight_layout's solver; bottom leaves room for the
+    # rotated multi-line period labels
+    fig.subplots_adjust(left=0.10, right=0.96, top=0.90, bottom=0.30)
+
+    buf = io.BytesIO()
+    fig.canvas.print_png(buf)
+    return buf.getvalue()
+
+
+def _render_period_plot(labels: List[str], vals: List[float], title: str) -> bytes:
+    """
+    Draws the top items bar chart (largest first) and returns the PNG bytes.
+    Plain sync so the route can run it off the event loop.
+    """
+    with _PLOT_LOCK:
+        fig = _plot_fig()
+        fig.clf()
+        ax = fig.add_subplot(111)
+        ax.barh(labels[::-1], vals[::-1])
+        ax.set_title(title)
+        ax.tick_params(axis="y", labelsize=8)
+        # Fixed margins instead of tight_layout's solver; left is wide for the labels
+        fig.subplots_adjust(left=0.28, right=0.96, top=0.92, bottom=0.10)
+
+        buf = io.BytesIO()
+        fig.canvas.print_png(buf)
+    return buf.getvalue()
+
+
+# Rendered outputs
+_render_cache: Dict[Tuple[int, bool], str] = {}  # (period_idx, debug) -> page HTML
+_plot_cache: Dict[int, bytes] = {}  # period_idx -> top items PNG
+_line_plot_cache: Dict[str, bytes] = {}  # resolved line_item -> trend PNG
+_LINE_PLOT_CACHE_MAX = 128
+
+
+async def _stream_into_render_cache(
+    stream: AsyncIterator[str],
+    key: Tuple[int, bool],
+    version: int,
+    flush_size: int = 8192
+) -> AsyncIterator[str]:
+    """
+    Forwards template output in ~flush_size chunks so the browser can start on
+    <head> before the table rows finish rendering, then keeps the full page
+    in _render_cache for repeat hits.
+    version: the state version captured before the page data was read; the
+    page is only cached if no re-parse has landed since.
+    """
+    chunks: List[str] = []
+    pending: List[str] = []
+    pending_len = 0
+
+    async for chunk in stream:
+        chunks.append(chunk)
+        pending.append(chunk)
+        pending_len += len(chunk)
+        if pending_len >= flush_size:
+            yield "".join(pending)
+            pending = []
+            pending_len = 0
+
+    if pending:
+        yield "".join(pending)
+
+    if LogicEngine.get_state().version == version:
+        _render_cache[key] = "".join(chunks)
 
 
 @bp.get("/balance-sheet")
 async def balance_sheet():
-    periods = _periods_list()
+    # Version first: everything below must come from this state or newer
+    _sync_caches()
+    version = LogicEngine.get_state().version
 
-    period_idx_raw = request.args.get("period_idx", None)
-    debug_raw = request.args.get("debug", "0")
-    debug = str(debug_raw).strip() == "1"
+    periods = _periods_list()
 
-    selected_idx = 0
-    if period_idx_raw is not None:
-        try:
-            selected_idx = int(period_idx_raw)
-        except Exception:
-            selected_idx = 0
+    selected_idx = _parse_period_idx(request.args.get("period_idx", None))
+    debug = request.args.get("debug", "0") == "1"
 
     if not periods:
         selected_period = ""
-        table_df = pd.DataFrame(columns=["line_item", "value", "value_numeric"])
     else:
         if selected_idx < 0 or selected_idx >= len(periods):
             selected_idx = 0
         selected_period = periods[selected_idx]
-        table_df = _period_table(selected_period)
 
-    key_metrics = _compute_key_metrics(table_df)
+    cache_key = (selected_idx, debug)
+    html = _render_cache.get(cache_key, None)
+    if html is not None:
+        return html
+
+    key_metrics = _compute_key_metrics(_period_df(selected_period))
+
+    rows = _period_rows(selected_period) if selected_period else []
+    columns = _TABLE_COLUMNS
 
     # You no longer have balance_sheet_details in the new system (unless you add it)
     details_cols: List[str] = []
     details_rows: List[Dict[str, Any]] = []
 
-    rows = table_df.to_dict(orient="records")
-    columns = list(table_df.columns)
+    # The top items chart only shows in the debug panel, so only build it then
+    top_items_svg = Markup("")
+    if debug and selected_period:
+        labels, vals = _top_items(selected_period)
+        top_items_svg = _top_items_svg(labels, vals, f"Balance Sheet (Top Items) — {selected_period}")
 
-    return await render_template(
+    stream = await stream_template(
         "balance_sheet.html",
         status=_status(),
         periods=periods,
@@ -279,7 +732,9 @@ async def balance_sheet():
         rows=rows,
         details_cols=details_cols,
         details_rows=details_rows,
+        top_items_svg=top_items_svg,
     )
+    return Response(_stream_into_render_cache(stream, cache_key, version), mimetype="text/html")
 
 
 @bp.get("/balance_sheet")
@@ -292,7 +747,7 @@ async def balance_sheet_line_item(line_item: str):
     raw_df = _raw_income_long()
     periods = _periods_list()
 
-    resolved = _resolve_line_item(raw_df, line_item)
+    resolved = _resolve_line_item(line_item)
     if resolved is None:
         return await render_template(
             "balance_sheet_item.html",
@@ -316,10 +771,9 @@ async def balance_sheet_line_item(line_item: str):
     nums = [float(x) for x in series_df["value_numeric"].tolist() if x is not None and pd.notna(x)]
     avg_val = (sum(nums) / len(nums)) if nums else None
 
-    latest_display = _fmt_number(latest_val)
-    avg_display = _fmt_number(avg_val)
+    latest_display, avg_display = _fmt_numbers([latest_val, avg_val])
 
-    series_rows = series_df.where(pd.notna(series_df), "").to_dict(orient="records")
+    series_rows = _df_records(series_df)
 
     return await render_template(
         "balance_sheet_item.html",
@@ -335,67 +789,44 @@ async def balance_sheet_line_item(line_item: str):
 
 @bp.get("/balance_sheet/<path:line_item>/plot.png")
 async def balance_sheet_line_item_plot(line_item: str):
+    # Version first, so a re-parse landing mid-request can't be cached under it
+    _sync_caches()
+    version = LogicEngine.get_state().version
+
     raw_df = _raw_income_long()
     periods = _periods_list()
 
-    resolved = _resolve_line_item(raw_df, line_item)
+    resolved = _resolve_line_item(line_item)
     if resolved is None:
         return Response(b"", mimetype="image/png")
 
+    cached = _line_plot_cache.get(resolved, None)
+    if cached is not None:
+        return Response(cached, mimetype="image/png")
+
     series_df = _series_for_line_item(raw_df, periods, resolved)
     if series_df.empty:
         return Response(b"", mimetype="image/png")
 
-    plot_df = series_df.copy()
-    plot_df["value_numeric"] = pd.to_numeric(plot_df["value_numeric"], errors="coerce")
-    plot_df = plot_df.iloc[::-1].reset_index(drop=True)  # oldest -> newest
-
-    x = plot_df["period"].tolist()
-    y = plot_df["value_numeric"].tolist()
+    png = await asyncio.to_thread(_render_line_item_plot, series_df, resolved)
 
-    max_ticks = 6
-    xs = list(range(len(x)))
-
-    fig = plt.figure(figsize=(10, 4.5))
-    ax = fig.add_subplot(111)
-    ax.plot(xs, y, marker="o")
-
-    n = len(xs)
-    if n <= max_ticks:
-        tick_pos = xs
-        tick_labels = x
-    else:
-        step = (n - 1) / (max_ticks - 1)
-        tick_pos = [int(round(i * step)) for i in range(max_ticks)]
-        tick_labels = [x[i] for i in tick_pos]
-
-    ax.set_xticks(tick_pos)
-    ax.set_xticklabels(tick_labels, rotation=35, fontsize=8)
-
-    ax.set_title(f"{resolved} over time")
-    ax.set_xlabel("Period")
-    ax.set_ylabel("Value (numeric)")
-    fig.tight_layout()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=150)
-    plt.close(fig)
-    buf.seek(0)
-
-    return Response(buf.read(), mimetype="image/png")
+    # Only cache if no re-parse landed since the version was captured
+    if LogicEngine.get_state().version == version:
+        if len(_line_plot_cache) >= _LINE_PLOT_CACHE_MAX:
+            # Evict the oldest entry (dicts keep insertion order)
+            _line_plot_cache.pop(next(iter(_line_plot_cache)))
+        _line_plot_cache[resolved] = png
+    return Response(png, mimetype="image/png")
 
 
 @bp.get("/balance-sheet/plot.png")
 async def balance_sheet_plot_png():
-    periods = _periods_list()
-    period_idx_raw = request.args.get("period_idx", None)
+    # Version first, so a re-parse landing mid-request can't be cached under it
+    _sync_caches()
+    version = LogicEngine.get_state().version
 
-    selected_idx = 0
-    if period_idx_raw is not None:
-        try:
-            selected_idx = int(period_idx_raw)
-        except Exception:
-            selected_idx = 0
+    periods = _periods_list()
+    selected_idx = _parse_period_idx(request.args.get("period_idx", None))
 
     if not periods:
         return Response(b"", mimetype="image/png")
@@ -403,34 +834,17 @@ async def balance_sheet_plot_png():
     if selected_idx < 0 or selected_idx >= len(periods):
         selected_idx = 0
 
-    period = periods[selected_idx]
-    df = _period_table(period)
-
-    if df.empty or "value_numeric" not in df.columns or "line_item" not in df.columns:
-        return Response(b"", mimetype="image/png")
+    cached = _plot_cache.get(selected_idx, None)
+    if cached is not None:
+        return Response(cached, mimetype="image/png")
 
-    tmp = df.copy()
-    tmp["value_numeric"] = pd.to_numeric(tmp["value_numeric"], errors="coerce")
-    tmp = tmp.dropna(subset=["value_numeric"])
-    if tmp.empty:
+    period = periods[selected_idx]
+    labels, vals = _top_items(period)
+    if not labels:
         return Response(b"", mimetype="image/png")
 
-    tmp["abs"] = tmp["value_numeric"].abs()
-    tmp = tmp.sort_values("abs", ascending=False).head(12)
-
-    labels = tmp["line_item"].tolist()
-    vals = tmp["value_numeric"].tolist()
-
-    fig = plt.figure(figsize=(10, 5))
-    ax = fig.add_subplot(111)
-    ax.barh(labels[::-1], vals[::-1])
-    ax.set_title(f"Income Statement (Top Items) — {period}")
-    ax.tick_params(axis="y", labelsize=8)
-    fig.tight_layout()
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=140)
-    plt.close(fig)
-    buf.seek(0)
+    png = await asyncio.to_thread(_render_period_plot, labels, vals, f"Income Statement (Top Items) — {period}")
 
-    return Response(buf.read(), mimetype="image/png")
+    if LogicEngine.get_state().version == version:
+        _plot_cache[selected_idx] = png
+    return Response(png, mimetype="image/png")
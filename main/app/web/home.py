@@ -4,6 +4,7 @@ from quart import Blueprint, render_template, request, redirect, url_for, jsonif
 from main.core.logic_engine import LogicEngine
 from main.handlers.income_statement import parse_income_statement_tables_from_path
 
+import asyncio
 import os
 
 
@@ -12,30 +13,41 @@ bp = Blueprint("home", __name__)
 upload_dir = os.path.join(os.getcwd(), "storage", "uploads")
 os.makedirs(upload_dir, exist_ok=True)
 
+# Excel parsing is blocking pandas/openpyxl work; it runs in a worker thread.
+# All parses share the one LogicEngine, so they run one at a time: a slow
+# parse finishing late must not overwrite a newer selection
+_parse_gate = asyncio.Lock()
+
 
 
 
 
 def _list_excel_files(upload_dir: str) -> list[str]:
+    # scandir entries carry the file type from readdir, so is_file() needs no extra stat
     try:
-        names = os.listdir(upload_dir)
+        with os.scandir(upload_dir) as it:
+            excel_files = [
+                e.name for e in it
+                if e.name.lower().endswith((".xlsx", ".xls")) and e.is_file()
+            ]
     except FileNotFoundError:
         return []
 
-    excel_files: list[str] = []
-    for name in names:
-        lower = name.lower()
-        if lower.endswith(".xlsx") or lower.endswith(".xls"):
-            full_path = os.path.join(upload_dir, name)
-            if os.path.isfile(full_path):
-                excel_files.append(name)
-
     excel_files.sort(key=str.lower)
     return excel_files
     
 def update_excel_path(new_path: str) -> None:
     LogicEngine.update_excel(new_path)
-    LogicEngine.parse_excel()
+    LogicEngine.parse_excel(new_path)
+
+
+async def update_excel_path_async(new_path: str) -> None:
+    """
+    Same as update_excel_path, but parses off the event loop so other
+    requests keep being served while the workbook is read.
+    """
+    async with _parse_gate:
+        await asyncio.to_thread(update_excel_path, new_path)
 
 
 @bp.get("/")
@@ -50,7 +62,7 @@ async def index():
         print("Nonr path, defaulting to first excel in list")
         if files:
             path = os.path.join(upload_dir, files[0])
-            update_excel_path(path)
+            await update_excel_path_async(path)
         
 
     # Convert full path -> filename so the <select> can match it
@@ -77,7 +89,7 @@ async def select_excel():
     # Do your parse here
 	# summary = await asyncio.to_thread(parse_excel, full_path)
     path = os.path.join(upload_dir, filename)
-    update_excel_path(path)
+    await update_excel_path_async(path)
 
     return jsonify({
         "ok": True,
@@ -127,7 +139,8 @@ async def upload_and_parse():
     State.set_status(f"Using: {os.path.basename(save_path)} | Parsing...")
 
     try:
-        parse_income_statement_tables_from_path(save_path, progress_cb=None)
+        async with _parse_gate:
+            await asyncio.to_thread(parse_income_statement_tables_from_path, save_path, None)
         State.set_status(f"Using: {os.path.basename(save_path)} | Parse complete.")
     except Exception as e:
         State.set_status(f"Parse failed: {e}")
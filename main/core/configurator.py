@@ -4,7 +4,7 @@
 # Notes:
 # - Human-editable JSON config
 # - Safe defaults merged into file values
-# - Thread-safe read/write (lock)
+# - Thread-safe read/write (lock); writes replace the file atomically
 # Used: Yes
 
 from __future__ import annotations
@@ -13,12 +13,22 @@ import json
 import os
 import threading
 from copy import deepcopy
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+	import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+	orjson = None
 
 
 _LOCK = threading.Lock()
 _CONFIG_PATH = os.path.join(os.getcwd(), "config")
 
+# Last merged config plus its flat {dotted.path: value} view, keyed by the
+# file's (st_mtime_ns, st_size) so an unchanged file costs one stat() instead
+# of a read + parse + merge. Readers share these dicts, so public getters copy
+_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any], Dict[str, Any]]] = None
+
 
 _DEFAULTS: Dict[str, Any] = {
 	"app": {
@@ -41,6 +51,29 @@ _DEFAULTS: Dict[str, Any] = {
 }
 
 
+def _dumps(obj: Any) -> bytes:
+	"""
+	Encode to indented UTF-8 JSON (orjson when available).
+	"""
+	if orjson is not None:
+		try:
+			return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+		except TypeError:
+			pass  # e.g. non-str keys or ints past 64 bits; let json handle them
+	return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+	if orjson is not None:
+		return orjson.loads(raw)
+	return json.loads(raw)
+
+
+# Fresh copies of the (plain JSON) defaults come from a _loads of this,
+# which is cheaper than deepcopy for a tree of small dicts and lists
+_DEFAULTS_JSON = _dumps(_DEFAULTS)
+
+
 def _deep_merge(dst: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
 	"""
 	Deep merge src into dst (mutates dst).
@@ -62,30 +95,129 @@ def _ensure_file_exists() -> None:
 	with _LOCK:
 		if os.path.exists(_CONFIG_PATH):
 			return
-		with open(_CONFIG_PATH, "w", encoding="utf-8") as f:
-			json.dump(_DEFAULTS, f, indent=2)
+		_write_locked(_DEFAULTS_JSON)
 
 
-def read_config() -> Dict[str, Any]:
+# _file_stamp() of a config file that doesn't exist
+_NO_FILE_STAMP = (-1, -1)
+
+
+def _file_stamp() -> Tuple[int, int]:
+	try:
+		st = os.stat(_CONFIG_PATH)
+	except FileNotFoundError:
+		return _NO_FILE_STAMP
+	return (st.st_mtime_ns, st.st_size)
+
+
+def _flatten(cfg: Dict[str, Any], prefix: str = "", out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
 	"""
-	Read config.json and merge defaults. Always returns a full config dict.
+	{dotted.path: value} for every key at every depth, so sub-dicts are
+	reachable by their own path too (e.g. "app" and "app.port").
+	"""
+	if out is None:
+		out = {}
+	for k, v in cfg.items():
+		key = f"{prefix}{k}"
+		out[key] = v
+		if isinstance(v, dict):
+			_flatten(v, key + ".", out)
+	return out
+
+
+def _cached() -> Tuple[Tuple[int, int], Dict[str, Any], Dict[str, Any]]:
+	"""
+	(stamp, merged config, flat view), re-read only when the file changes.
 	"""
-	_ensure_file_exists()
+	global _cache
+
+	# One stat() per call; the defaults are only written out if it finds no file
+	stamp = _file_stamp()
+	if stamp == _NO_FILE_STAMP:
+		_ensure_file_exists()
+		stamp = _file_stamp()
+
+	cached = _cache
+	if cached is not None and cached[0] == stamp:
+		return cached
 
+	# Only the raw read holds the lock: on Windows os.replace fails while another
+	# thread has the file open, so reads must not overlap a write
 	with _LOCK:
-		try:
-			with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
-				data = json.load(f)
-		except Exception:
-			data = {}
+		stamp = _file_stamp()
+		raw = _read_raw_locked()
+
+	merged = _merge_raw(raw)
+	cached = (stamp, merged, _flatten(merged))
+	_cache = cached
+	return cached
+
+
+def _read_merged() -> Dict[str, Any]:
+	"""
+	Merged config (defaults + file), straight from the cache.
+	"""
+	return _cached()[1]
+
 
-	merged = deepcopy(_DEFAULTS)
+def _read_raw_locked() -> bytes:
+	"""
+	Raw bytes of the config file (caller holds _LOCK).
+	"""
+	try:
+		with open(_CONFIG_PATH, "rb") as f:
+			return f.read()
+	except Exception:
+		return b""
+
+
+def _merge_raw(raw: bytes) -> Dict[str, Any]:
+	"""
+	Parse raw file bytes and merge them over the defaults.
+	"""
+	try:
+		data = _loads(raw)
+	except Exception:
+		data = {}
+
+	merged = _loads(_DEFAULTS_JSON)
 	if isinstance(data, dict):
 		_deep_merge(merged, data)
-
 	return merged
 
 
+def _read_locked() -> Dict[str, Any]:
+	"""
+	Read the file and merge it over the defaults, bypassing the cache
+	(caller holds _LOCK, e.g. for a read-modify-write).
+	"""
+	return _merge_raw(_read_raw_locked())
+
+
+def _write_locked(buf: bytes) -> None:
+	"""
+	Atomically replace the config file with buf (caller holds _LOCK).
+	Readers see either the old file or the new one, never a partial write.
+	"""
+	global _cache
+
+	tmp = _CONFIG_PATH + ".tmp"
+	with open(tmp, "wb") as f:
+		f.write(buf)
+	os.replace(tmp, _CONFIG_PATH)
+
+	# buf is a full config, so parsing it gives what the next read would
+	merged = _loads(buf)
+	_cache = (_file_stamp(), merged, _flatten(merged))
+
+
+def read_config() -> Dict[str, Any]:
+	"""
+	Read config.json and merge defaults. Always returns a full config dict.
+	"""
+	return deepcopy(_read_merged())
+
+
 def write_config(new_config: Dict[str, Any]) -> Dict[str, Any]:
 	"""
 	Write config.json. Also returns the merged final config (defaults + new_config).
@@ -93,12 +225,14 @@ def write_config(new_config: Dict[str, Any]) -> Dict[str, Any]:
 	if not isinstance(new_config, dict):
 		new_config = {}
 
-	final_cfg = deepcopy(_DEFAULTS)
+	final_cfg = _loads(_DEFAULTS_JSON)
 	_deep_merge(final_cfg, new_config)
 
+	# Encode before taking the lock so it is only held for the file write
+	buf = _dumps(final_cfg)
+
 	with _LOCK:
-		with open(_CONFIG_PATH, "w", encoding="utf-8") as f:
-			json.dump(final_cfg, f, indent=2)
+		_write_locked(buf)
 
 	return final_cfg
 
@@ -108,20 +242,24 @@ def update_config(path: str, value: Any) -> Dict[str, Any]:
 	Update a single config key by dotted path, e.g.:
 		update_config("app.max_plot_ticks", 5)
 	"""
-	cfg = read_config()
-
 	parts = [p for p in path.split(".") if p.strip()]
 	if not parts:
-		return cfg
+		return read_config()
 
-	cur = cfg
-	for p in parts[:-1]:
-		if p not in cur or not isinstance(cur[p], dict):
-			cur[p] = {}
-		cur = cur[p]
+	# One lock across read-modify-write, so concurrent updates can't drop each other's change
+	with _LOCK:
+		cfg = _read_locked()
 
-	cur[parts[-1]] = value
-	return write_config(cfg)
+		cur = cfg
+		for p in parts[:-1]:
+			if p not in cur or not isinstance(cur[p], dict):
+				cur[p] = {}
+			cur = cur[p]
+
+		cur[parts[-1]] = value
+		_write_locked(_dumps(cfg))
+
+	return cfg
 
 
 def get_config(path: str) -> Any:
@@ -129,16 +267,16 @@ def get_config(path: str) -> Any:
     Get a single config key by dotted path, e.g.:
         get_config("app.max_plot_ticks")
     """
-    cfg = read_config()
-
-    parts = [p for p in path.split(".") if p.strip()]
-    if not parts:
-        return None
+    flat = _cached()[2]
 
-    cur = cfg
-    for p in parts:
-        if p not in cur:
+    if path in flat:
+        cur = flat[path]
+    else:
+        # Tolerate empty segments ("app..port") the way the old path walk did
+        parts = [p for p in path.split(".") if p.strip()]
+        if not parts:
             return None
-        cur = cur[p]
+        cur = flat.get(".".join(parts), None)
 
-    return cur
+    # Scalars are immutable; only containers need copying on the way out
+    return deepcopy(cur) if isinstance(cur, (dict, list)) else cur
@@ -8,15 +8,58 @@
 
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+
+
+# One path segment: any char but "." or "\", or "\" + the char it escapes.
+# A trailing lone "\" matches too and is dropped by the unescape below
+_PATH_PART_RE = re.compile(r"(?:[^.\\]|\\.|\\\Z)*", re.S)
+_PATH_UNESCAPE_RE = re.compile(r"\\(.?)", re.S)
+
+
+def _unescape(m: re.Match) -> str:
+    # A callable replacement skips re.sub's template expansion
+    return m.group(1)
+
+
+# The split depends only on the string, so it never needs invalidating; the
+# app looks up the same few paths over and over
+@lru_cache(maxsize=4096)
+def _split_path_cached(path: str) -> tuple[str, ...]:
+    """
+    GlobalState._split_path as an immutable tuple (shared between callers).
+    """
+    # No escapes (the usual case): a plain split does it
+    if "\\" not in path:
+        return tuple(p for p in path.split(".") if p)
+
+    parts = []
+    for p in _PATH_PART_RE.findall(path):
+        if "\\" in p:
+            p = _PATH_UNESCAPE_RE.sub(_unescape, p)
+        if p:
+            parts.append(p)
+    return tuple(parts)
+
 
 class GlobalState:
     def __init__(self):
         self.excel_path = None
         self._data = {}
+        # Bumped on every write so readers can tell when cached views are stale
+        self.version = 0
 
     # Inserts a piece of data into the data dictionary
     def insert_data(self, index: str, data) -> None:
         self._data[index] = data
+        self.version += 1
+
+    # Inserts several entries together under a single version bump, so readers
+    # never see a half-applied batch and caches are invalidated once
+    def insert_many(self, items: dict) -> None:
+        self._data.update(items)
+        self.version += 1
 
     def _split_path(self, path: str) -> list[str]:
         """
@@ -28,37 +71,29 @@ class GlobalState:
         """
         if not isinstance(path, str) or not path:
             return []
-
-        parts = []
-        buf = []
-        escaped = False
-
-        for ch in path:
-            if escaped:
-                buf.append(ch)
-                escaped = False
-                continue
-
-            if ch == "\\":
-                escaped = True
-                continue
-
-            if ch == ".":
-                parts.append("".join(buf))
-                buf = []
-                continue
-
-            buf.append(ch)
-
-        parts.append("".join(buf))
-        return [p for p in parts if p != ""]
+        return list(_split_path_cached(path))
 
     def _resolve_parent(self, path: str):
         """
         Returns (parent_dict, final_key) for a path.
         If it can't resolve, returns (None, None).
         """
-        keys = self._split_path(path)
+        if not isinstance(path, str):
+            return None, None
+
+        # Fast paths for escape-free 1- and 2-segment paths (what the app looks up)
+        if "\\" not in path:
+            if "." not in path:
+                return (self._data, path) if path else (None, None)
+
+            head, _, tail = path.partition(".")
+            if head and tail and "." not in tail:
+                cur = self._data.get(head, None)
+                if not isinstance(cur, dict):
+                    return None, None
+                return cur, tail
+
+        keys = _split_path_cached(path)
 
         if not keys:
             return None, None
@@ -95,6 +130,7 @@ class GlobalState:
         if final_key not in parent:
             return False
         parent[final_key] = value
+        self.version += 1
         return True
 
     def find_all(self, key: str) -> list[tuple[str, object]]:
@@ -103,42 +139,50 @@ class GlobalState:
         Returns a list of (path, value).
         """
         results = []
-        self._find_all_recursive(self._data, key, prefix="", out=results)
-        return results
 
-    def _find_all_recursive(self, data, key: str, prefix: str, out: list):
-        if not isinstance(data, dict):
-            return
+        # Explicit stack of (items iterator, path prefix) instead of recursion:
+        # no frame per dict, no recursion limit, and the same depth-first order
+        stack = [(iter(self._data.items()), "")]
+        while stack:
+            items, prefix = stack[-1]
+            for k, v in items:
+                path = f"{prefix}.{k}" if prefix else str(k)
 
-        for k, v in data.items():
-            path = f"{prefix}.{k}" if prefix else str(k)
+                if k == key:
+                    results.append((path, v))
 
-            if k == key:
-                out.append((path, v))
+                if isinstance(v, dict):
+                    stack.append((iter(v.items()), path))
+                    break
+            else:
+                stack.pop()
 
-            if isinstance(v, dict):
-                self._find_all_recursive(v, key, path, out)
+        return results
 
     def update_all(self, key: str, value) -> int:
         """
         Updates ALL occurrences of a key anywhere in _data.
         Returns the number of updates performed.
         """
-        return self._update_all_recursive(self._data, key, value)
-
-    def _update_all_recursive(self, data, key: str, value) -> int:
-        if not isinstance(data, dict):
-            return 0
-
         count = 0
-        for k, v in data.items():
-            if k == key:
-                data[k] = value
-                count += 1
-
-            if isinstance(v, dict):
-                count += self._update_all_recursive(v, key, value)
 
+        # Same explicit stack walk as find_all, keeping each dict to assign into
+        stack = [(self._data, iter(self._data.items()))]
+        while stack:
+            data, items = stack[-1]
+            for k, v in items:
+                if k == key:
+                    data[k] = value
+                    count += 1
+
+                if isinstance(v, dict):
+                    stack.append((v, iter(v.items())))
+                    break
+            else:
+                stack.pop()
+
+        if count:
+            self.version += 1
         return count
 
     # Basic attribute access
@@ -6,7 +6,10 @@
 # - Supports shallow lookup + optional deep recursive lookup
 # Used: Yes
 
+import os
+
 from main.core.global_state import GlobalState
+from main.handlers.workbook import open_workbook
 from main.handlers.income_statement import parse_income_statement_tables_from_path
 from main.handlers.balance_sheet import parse_balance_sheet_tables_from_path
 
@@ -16,6 +19,8 @@ class Engine():
         self._created_timestamp = "hi"
         state = GlobalState()
         self.GlobalState = state
+        # (path, st_mtime_ns, st_size) of the last workbook parsed into state
+        self._last_parsed_signature = None
 
 
 
@@ -27,13 +32,34 @@ class Engine():
         self.GlobalState.excel_path = path
 
 
-    def parse_excel(self):
-        if self.GlobalState.excel_path == None:
+    def parse_excel(self, path=None):
+        # path: the workbook to parse; defaults to the state's current excel_path
+        if path == None:
+            path = self.GlobalState.excel_path
+        if path == None:
             print("path is none?")
             return
-        income_statement = parse_income_statement_tables_from_path(self.GlobalState.excel_path)
-        self.GlobalState.insert_data("income_statement", income_statement)
-        balance_sheet = parse_balance_sheet_tables_from_path(self.GlobalState.excel_path)
-        self.GlobalState.insert_data("balance_sheet", balance_sheet)
+
+        # Re-selecting the same, unchanged file keeps what's already parsed
+        try:
+            st = os.stat(path)
+            sig = (path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            sig = None
+        if sig is not None and sig == self._last_parsed_signature:
+            return
+
+        # Open the workbook once and share it between both statement parsers
+        book = open_workbook(path)
+        try:
+            income_statement = parse_income_statement_tables_from_path(path, workbook=book)
+            balance_sheet = parse_balance_sheet_tables_from_path(path, workbook=book)
+        finally:
+            book.close()
+        self.GlobalState.insert_many({
+            "income_statement": income_statement,
+            "balance_sheet": balance_sheet,
+        })
+        self._last_parsed_signature = sig
 
 LogicEngine = Engine()
\ No newline at end of file
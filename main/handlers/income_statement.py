@@ -9,13 +9,21 @@
 
 from __future__ import annotations
 
+import operator
 import os
 
+import numpy as np
 import pandas as pd
 
+from main.handlers.workbook import open_workbook, sheet_names, load_sheet_rows
 
 
 
+
+# Normalized first-column labels of header rows that sit among the line items
+_SKIP_NORM_LABELS = frozenset({"for the fiscal period ending", "currency"})
+
+
 def _norm(text: object) -> str:
     if text is None or (isinstance(text, float) and pd.isna(text)):
         return ""
@@ -33,22 +41,47 @@ def _clean_cell(value: object):
     return value
 
 
+def _label_parts(value: object) -> tuple[str, str]:
+    """
+    (line_item, normalized label) for a first-column cell, ("", "") when blank.
+    Same results as _clean_cell -> str().strip() and _norm, with one clean
+    and one strip per label instead of repeating them.
+    """
+    label = _clean_cell(value)
+    if label is None:
+        return "", ""
+    line_item = label if isinstance(label, str) else str(label).strip()
+    return line_item, " ".join(line_item.lower().split())
+
+
+# What a float() string can start with; anything else (Capital IQ codes like
+# "NM", "NA", "REP") is rejected up front instead of raising inside float()
+_NUMBER_START = frozenset("0123456789+-.")
+_FLOAT_WORDS = frozenset({"inf", "infinity", "nan"})
+
+
 def _parse_numeric(value: object):
     if value is None:
         return None
 
-    if isinstance(value, (int, float)) and not (isinstance(value, float) and pd.isna(value)):
+    # value == value is False only for NaN, which falls through to float("nan") as before
+    if isinstance(value, (int, float)) and value == value:
         return float(value)
 
     s = str(value).strip()
-    if s == "":
+    if not s:
         return None
 
-    neg = s.startswith("(") and s.endswith(")")
+    neg = s[0] == "(" and s[-1] == ")"
     if neg:
         s = s[1:-1]
 
+    # Commas go first, so ",5" style strings still reach float() below
+    # (str.replace beats a str.translate table for dropping a single character)
     s = s.replace(",", "")
+    if s.lstrip()[:1] not in _NUMBER_START and s.strip().lower() not in _FLOAT_WORDS:
+        return None
+
     try:
         num = float(s)
         return -num if neg else num
@@ -56,37 +89,85 @@ def _parse_numeric(value: object):
         return None
 
 
-def _find_income_statement_start(raw: pd.DataFrame) -> int | None:
+def _parse_block(block: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cleans + parses a whole 2-D block of raw cells at once.
+    Returns (values, present) shaped like block: values holds a float where the
+    cell is numeric, otherwise the cleaned cell; present is False for blank
+    cells (None, NaN, "", "-"), which are not stored.
+    Plain int/float cells (nearly all of them) convert in one astype; only the
+    rest (text, "(1,234)" style negatives, dates) goes cell by cell through
+    _clean_cell/_parse_numeric.
+    """
+    flat = block.ravel()
+    values = flat.copy()
+    # "-" is how Capital IQ shows an empty value
+    present = np.not_equal(flat, None) & np.not_equal(flat, "-")
+
+    idx = np.flatnonzero(present)
+    cells = flat[idx]
+    is_num = np.fromiter((type(v) is float or type(v) is int for v in cells), dtype=bool, count=len(cells))
+
+    num_idx = idx[is_num]
+    nums = cells[is_num].astype("float64")
+    values[num_idx] = nums
+    present[num_idx[np.isnan(nums)]] = False
+
+    for k in idx[~is_num]:
+        cell = _clean_cell(flat[k])
+        if cell is None:
+            present[k] = False
+            continue
+        num = _parse_numeric(cell)
+        values[k] = num if num is not None else cell
+
+    return values.reshape(block.shape), present.reshape(block.shape)
+
+
+# Capital IQ puts the header near the top; the whole sheet is only scanned as a fallback
+_HEADER_SCAN_ROWS = 100
+
+
+def _scan_income_statement_start(rows: list[tuple], n_rows: int) -> int | None:
     # Fast pass: first column
-    for r in range(len(raw)):
-        if _norm(raw.iat[r, 0]) == "income statement":
+    for r in range(n_rows):
+        if _norm(rows[r][0]) == "income statement":
             return r
 
     # Wider pass: check first ~12 columns
-    max_c = min(raw.shape[1], 12)
-    for r in range(len(raw)):
+    max_c = min(len(rows[0]) if rows else 0, 12)
+    for r in range(n_rows):
         for c in range(max_c):
-            if _norm(raw.iat[r, c]) == "income statement":
+            if _norm(rows[r][c]) == "income statement":
                 return r
 
     return None
 
 
-def _build_period_labels(raw: pd.DataFrame, start_row: int) -> list[str | None]:
+def _find_income_statement_start(rows: list[tuple]) -> int | None:
+    start = _scan_income_statement_start(rows, min(len(rows), _HEADER_SCAN_ROWS))
+    if start is None and len(rows) > _HEADER_SCAN_ROWS:
+        print(f"Income Statement header not in the first {_HEADER_SCAN_ROWS} rows, scanning the whole sheet")
+        start = _scan_income_statement_start(rows, len(rows))
+    return start
+
+
+def _build_period_labels(rows: list[tuple], start_row: int) -> list[str | None]:
     """
     Capital IQ typically has two header rows under the "Income Statement" header.
     We combine them into one string per column: "<top> <bottom>".
     """
-    labels: list[str | None] = [None] * raw.shape[1]
+    width = len(rows[0]) if rows else 0
+    labels: list[str | None] = [None] * width
 
     r1 = start_row + 1
     r2 = start_row + 2
-    if r2 >= len(raw):
+    if r2 >= len(rows):
         return labels
 
-    for c in range(1, raw.shape[1]):
-        top = _clean_cell(raw.iat[r1, c]) if r1 < len(raw) else None
-        bot = _clean_cell(raw.iat[r2, c]) if r2 < len(raw) else None
+    for c in range(1, width):
+        top = _clean_cell(rows[r1][c]) if r1 < len(rows) else None
+        bot = _clean_cell(rows[r2][c]) if r2 < len(rows) else None
 
         if top and bot:
             labels[c] = f"{top} {bot}"
@@ -110,30 +191,39 @@ def _extract_col_to_period(period_labels: list[str | None]) -> dict[int, str]:
     return col_to_period
 
 
-def parse_income_statement_tables_from_path(path: str, progress_cb=None) -> None:
+def parse_income_statement_tables_from_path(path: str, progress_cb=None, workbook=None) -> None:
     print(path)
     """
     Reads the income statement sheet and saves the extracted values to:
         State._data["income_statement"][period][line_item] = value_numeric_or_raw
 
     If numeric parsing fails, we store the cleaned raw cell.
+
+    workbook: optional handle from main.handlers.workbook.open_workbook(path), so
+    callers parsing several statements from one file only open it once.
     """
     def push(msg: str) -> None:
         if progress_cb:
             progress_cb(msg)
 
     push("Opening Excel...")
-    xl = pd.ExcelFile(path)
+    book = workbook if workbook is not None else open_workbook(path)
+    try:
+        names = sheet_names(book)
 
-    # Pick a sheet likely to be the income statement
-    sheet_candidates = [s for s in xl.sheet_names if "income" in s.lower()]
-    sheet_name = sheet_candidates[0] if sheet_candidates else xl.sheet_names[0]
+        # Pick a sheet likely to be the income statement
+        sheet_candidates = [s for s in names if "income" in s.lower()]
+        sheet_name = sheet_candidates[0] if sheet_candidates else names[0]
 
-    push(f"Reading sheet: {sheet_name}")
-    raw = pd.read_excel(xl, sheet_name=sheet_name, header=None)
+        push(f"Reading sheet: {sheet_name}")
+        # One pass over the sheet into plain tuples; everything below indexes lists
+        rows = load_sheet_rows(book, sheet_name)
+    finally:
+        if workbook is None:
+            book.close()
 
     push("Locating Income Statement header...")
-    start_row = _find_income_statement_start(raw)
+    start_row = _find_income_statement_start(rows)
     if start_row is None:
         # Store an error payload in the same structure the UI expects
         State.insert_data("income_statement", {"_error": f"Could not find 'Income Statement' in '{sheet_name}'"})
@@ -141,7 +231,7 @@ def parse_income_statement_tables_from_path(path: str, progress_cb=None) -> None
         return
 
     push("Building period labels...")
-    period_labels = _build_period_labels(raw, start_row)
+    period_labels = _build_period_labels(rows, start_row)
     col_to_period = _extract_col_to_period(period_labels)
 
     # Create root dict
@@ -155,34 +245,33 @@ def parse_income_statement_tables_from_path(path: str, progress_cb=None) -> None
             income_statement[period] = {}
 
     push("Extracting line items and values...")
-    for r in range(start_row + 3, len(raw)):
-        label = _clean_cell(raw.iat[r, 0])
-        label_norm = _norm(label)
-
-        if not label_norm:
+    item_rows: list[int] = []
+    line_items: list[str] = []
+    first_item_row = start_row + 3
+    # Labels for every candidate row, worked out once before the row loop
+    labels = [_label_parts(row[0]) for row in rows[first_item_row:]]
+    for r, (line_item, label_norm) in enumerate(labels, first_item_row):
+        # Blank rows and common non-line-item header rows
+        if not label_norm or label_norm in _SKIP_NORM_LABELS:
             continue
 
-        # Skip common non-line-item header rows
-        if label_norm in {"for the fiscal period ending", "currency"}:
-            continue
-
-        line_item = str(label).strip()
-        if not line_item:
-            continue
-
-        for c, period in col_to_period.items():
-            cell = _clean_cell(raw.iat[r, c])
-            if cell is None:
-                continue
-
-            num = _parse_numeric(cell)
-            value_to_store = num if num is not None else cell
-
-            # Ensure period dict exists
-            if period not in income_statement:
-                income_statement[period] = {}
-
-            income_statement[period][line_item] = value_to_store
+        item_rows.append(r)
+        line_items.append(line_item)
+
+    cols = list(col_to_period.keys())
+    if item_rows and cols:
+        # Clean + parse every value cell of the line item rows in one pass
+        pick = operator.itemgetter(*cols)
+        block = np.array([pick(rows[r]) for r in item_rows], dtype=object).reshape(len(item_rows), len(cols))
+        values, present = _parse_block(block)
+
+        periods = [col_to_period[c] for c in cols]
+        for i, line_item in enumerate(line_items):
+            row_vals = values[i]
+            row_present = present[i]
+            for j, period in enumerate(periods):
+                if row_present[j]:
+                    income_statement[period][line_item] = row_vals[j]
 
     push("Saving income_statement into State._data...")
     return income_statement
\ No newline at end of file
@@ -13,6 +13,10 @@ from typing import Optional, Tuple, List, Dict, Any, Callable
 import pandas as pd
 
 from main.globals.global_state import State
+from main.handlers.workbook import open_workbook, sheet_names, load_sheet_rows
+
+
+_SKIP_NORM_LABELS = frozenset({"for the fiscal period ending", "currency"})
 
 
 def _norm(text: object) -> str:
@@ -54,30 +58,43 @@ def _parse_numeric(value: object) -> Optional[float]:
         return None
 
 
-def _find_income_statement_start(raw: pd.DataFrame) -> Optional[int]:
-    for i in range(len(raw)):
-        if _norm(raw.iat[i, 0]) == "income statement":
+# Capital IQ puts the header near the top; the whole sheet is only scanned as a fallback
+_HEADER_SCAN_ROWS = 100
+
+
+def _scan_income_statement_start(rows: List[tuple], n_rows: int) -> Optional[int]:
+    for i in range(n_rows):
+        if _norm(rows[i][0]) == "income statement":
             return i
 
-    for i in range(len(raw)):
-        for j in range(min(raw.shape[1], 12)):
-            if _norm(raw.iat[i, j]) == "income statement":
+    width = len(rows[0]) if rows else 0
+    for i in range(n_rows):
+        for j in range(min(width, 12)):
+            if _norm(rows[i][j]) == "income statement":
                 return i
 
     return None
 
 
-def _build_period_labels(raw: pd.DataFrame, start_row: int) -> List[Optional[str]]:
-    labels: List[Optional[str]] = [None] * raw.shape[1]
+def _find_income_statement_start(rows: List[tuple]) -> Optional[int]:
+    start = _scan_income_statement_start(rows, min(len(rows), _HEADER_SCAN_ROWS))
+    if start is None and len(rows) > _HEADER_SCAN_ROWS:
+        start = _scan_income_statement_start(rows, len(rows))
+    return start
+
+
+def _build_period_labels(rows: List[tuple], start_row: int) -> List[Optional[str]]:
+    width = len(rows[0]) if rows else 0
+    labels: List[Optional[str]] = [None] * width
     r1 = start_row + 1
     r2 = start_row + 2
 
-    if r2 >= len(raw):
+    if r2 >= len(rows):
         return labels
 
-    for c in range(1, raw.shape[1]):
-        top = _clean_cell(raw.iat[r1, c]) if r1 < len(raw) else None
-        bot = _clean_cell(raw.iat[r2, c]) if r2 < len(raw) else None
+    for c in range(1, width):
+        top = _clean_cell(rows[r1][c]) if r1 < len(rows) else None
+        bot = _clean_cell(rows[r2][c]) if r2 < len(rows) else None
 
         if top and bot:
             labels[c] = f"{top} {bot}"
@@ -133,16 +150,20 @@ def parse_income_statement_tables_from_path(
             progress_cb(msg)
 
     push("Opening Excel...")
-    xl = pd.ExcelFile(path)
+    book = open_workbook(path)
+    try:
+        names = sheet_names(book)
 
-    sheet_candidates = [s for s in xl.sheet_names if "income" in s.lower()]
-    sheet_name = sheet_candidates[0] if sheet_candidates else xl.sheet_names[0]
+        sheet_candidates = [s for s in names if "income" in s.lower()]
+        sheet_name = sheet_candidates[0] if sheet_candidates else names[0]
 
-    push(f"Reading sheet: {sheet_name}")
-    raw = pd.read_excel(xl, sheet_name=sheet_name, header=None)
+        push(f"Reading sheet: {sheet_name}")
+        rows = load_sheet_rows(book, sheet_name)
+    finally:
+        book.close()
 
     push("Locating Income Statement header...")
-    start_row = _find_income_statement_start(raw)
+    start_row = _find_income_statement_start(rows)
     if start_row is None:
         set_table("income_statement_raw", pd.DataFrame())
         set_table("income_statement_details", pd.DataFrame([{"key": "error", "value": f"Could not find 'Income Statement' in '{sheet_name}'"}]))
@@ -150,25 +171,29 @@ def parse_income_statement_tables_from_path(
         push("Failed: Income Statement header not found.")
         return
 
-    period_labels = _build_period_labels(raw, start_row)
+    period_labels = _build_period_labels(rows, start_row)
     periods, col_to_period = _extract_periods_and_colmap(period_labels)
 
     push(f"Detected periods: {len(periods)}")
     if periods:
         push(f"Most recent period: {periods[0]}")
 
-    records: List[Dict[str, Any]] = []
+    # Column buffers (one list per output column) rather than a dict per data point
+    line_items: List[str] = []
+    periods_out: List[str] = []
+    values_out: List[Any] = []
+    nums_out: List[Optional[float]] = []
+    cols_out: List[int] = []
     line_item_seen: set[str] = set()
 
     push("Extracting line items and values...")
-    for r in range(start_row + 3, len(raw)):
-        label = _clean_cell(raw.iat[r, 0])
+    width = len(rows[0]) if rows else 0
+    for r in range(start_row + 3, len(rows)):
+        row = rows[r]
+        label = _clean_cell(row[0])
         label_norm = _norm(label)
 
-        if not label_norm:
-            continue
-
-        if label_norm in {"for the fiscal period ending", "currency"}:
+        if not label_norm or label_norm in _SKIP_NORM_LABELS:
             continue
 
         line_item = str(label).strip()
@@ -177,27 +202,28 @@ def parse_income_statement_tables_from_path(
 
         line_item_seen.add(line_item)
 
-        for c in range(1, raw.shape[1]):
+        for c in range(1, width):
             period = col_to_period.get(c)
             if not period:
                 continue
 
-            cell = _clean_cell(raw.iat[r, c])
+            cell = _clean_cell(row[c])
             if cell is None:
                 continue
 
-            records.append({
-                "line_item": line_item,
-                "period": period,
-                "value": cell,
-                "value_numeric": _parse_numeric(cell),
-                "col_index": c
-            })
-
-    raw_table = pd.DataFrame(
-        records,
-        columns=["line_item", "period", "value", "value_numeric", "col_index"]
-    ).reset_index(drop=True)
+            line_items.append(line_item)
+            periods_out.append(period)
+            values_out.append(cell)
+            nums_out.append(_parse_numeric(cell))
+            cols_out.append(c)
+
+    raw_table = pd.DataFrame({
+        "line_item": line_items,
+        "period": periods_out,
+        "value": values_out,
+        "value_numeric": nums_out,
+        "col_index": cols_out
+    })
 
     details_rows = [
         {"key": "sheet_name", "value": sheet_name},
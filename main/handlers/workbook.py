@@ -0,0 +1,79 @@
+# File name: workbook.py
+# Created: 10/15/2026 10:10 AM
+# Purpose: Open a Capital IQ workbook once and read raw sheet rows for the statement handlers
+# Notes:
+# - .xlsx/.xlsm (zip) workbooks are streamed with openpyxl in read-only mode
+# - Anything else (legacy .xls) falls back to pandas/xlrd
+# - Rows are plain tuples (None for blanks), so handlers index lists instead of DataFrame.iat
+# - Each sheet is parsed at most once per open book, however many handlers read it
+# Used: Yes
+
+from __future__ import annotations
+
+import weakref
+import zipfile
+
+import openpyxl
+import pandas as pd
+from openpyxl.cell.cell import ERROR_CODES
+
+
+# Strings pandas' read_excel treats as missing by default, plus Excel error
+# values (pandas turns error cells into NaN), so both read paths agree
+_MISSING_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}) | frozenset(ERROR_CODES)
+
+# {book: {sheet_name: rows}}; entries go away with the book object
+_sheet_rows_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def open_workbook(path: str):
+    """
+    Opens the workbook at path for row reads. Returns a read-only openpyxl
+    workbook for zip-based files, otherwise a pd.ExcelFile.
+    The caller owns the handle and should .close() it (both types support it).
+    """
+    if zipfile.is_zipfile(path):
+        return openpyxl.load_workbook(path, read_only=True, data_only=True)
+    return pd.ExcelFile(path)
+
+
+def sheet_names(book) -> list[str]:
+    if isinstance(book, pd.ExcelFile):
+        return list(book.sheet_names)
+    return list(book.sheetnames)
+
+
+def load_sheet_rows(book, sheet_name: str) -> list[tuple]:
+    """
+    Every row of a sheet as a tuple of raw cell values, padded with None to the
+    widest row. Blank and missing-value cells come back as None.
+    Repeat reads of a sheet from the same book return the list from the first
+    read, e.g. when both statement handlers fall back to the first sheet.
+    """
+    per_book = _sheet_rows_cache.setdefault(book, {})
+    rows = per_book.get(sheet_name, None)
+    if rows is None:
+        rows = _read_sheet_rows(book, sheet_name)
+        per_book[sheet_name] = rows
+    return rows
+
+
+def _read_sheet_rows(book, sheet_name: str) -> list[tuple]:
+    if isinstance(book, pd.ExcelFile):
+        raw = pd.read_excel(book, sheet_name=sheet_name, header=None)
+        raw = raw.astype(object).where(raw.notna(), None)
+        rows = list(raw.itertuples(index=False, name=None))
+    else:
+        ws = book[sheet_name]
+        # Some writers record a bogus sheet size; read-only mode trusts it unless reset
+        ws.reset_dimensions()
+        rows = [
+            tuple(None if (type(v) is str and v in _MISSING_STRINGS) else v for v in row)
+            for row in ws.iter_rows(values_only=True)
+        ]
+
+    width = max((len(r) for r in rows), default=0)
+    return [r if len(r) == width else r + (None,) * (width - len(r)) for r in rows]